@@ -1,74 +1,92 @@
 import subprocess
+from bisect import bisect_left
 import re
 import os
-from collections import defaultdict
+from collections import defaultdict, Counter
+from contextlib import closing
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, groupby
 import difflib
 
-def get_git_history(file_path):
-    """Get the Git history for a specific file."""
+# Patterns compiled once at import time instead of inside the parsing/matching loops
+_WS_RE = re.compile(r'\s+')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
+def iter_git_lines(file_path, cwd=None):
+    """Stream the Git history for a specific file line by line.
+    
+    git runs in cwd (the repository path) when given, leaving the process directory untouched.
+    """
     try:
-        # Get the full git log with line changes for the specific file
-        cmd = ["git", "log", "-p", "--follow", file_path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.stdout
+        # Only commits that add or modify the file are useful, and only their added lines
+        # matter, so drop context lines (-U0) and colour codes to keep the output small.
+        # Each commit header is reduced to a NUL marker followed by the strict ISO author date.
+        cmd = [
+            "git", "log", "-p", "--follow", "--diff-filter=AMR", "--unified=0", "--no-color",
+            "--pretty=format:%x00%aI",
+        ]
+        cmd += ["--", file_path]
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, text=True, bufsize=1)
     except Exception as e:
         print(f"Error getting git history: {e}")
-        return ""
+        return
+    
+    try:
+        for line in proc.stdout:
+            yield line.rstrip("\n")
+    finally:
+        proc.stdout.close()
+        proc.wait()
 
-def extract_content_with_dates(git_history):
-    """Extract all content lines with their addition dates from git history."""
-    # Regular expressions to match commit dates and added lines
-    date_pattern = re.compile(r"Date:\s+(.+)")
-    addition_pattern = re.compile(r"^\+\s*(?!\+\+\+)(.+)$", re.MULTILINE)
+def extract_content_with_dates(git_lines, needed_lines=None):
+    """Extract all content lines with their addition dates from streamed git history.
     
+    If needed_lines is given, reading stops as soon as every one of them has been dated.
+    """
     # Store lines with their earliest addition date
     content_dates = {}
     current_date = None
+    missing_lines = set(needed_lines) if needed_lines is not None else None
     
-    # Split git history by commits (newest first)
-    commits = git_history.split("commit ")
-    for commit in commits:
-        if not commit.strip():
-            continue
-            
-        # Extract date
-        date_match = date_pattern.search(commit)
-        if date_match:
-            date_str = date_match.group(1).strip()
-            try:
-                # Parse the git date format
-                current_date = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-            except ValueError:
-                try:
-                    # Alternative date format
-                    current_date = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y")
-                except ValueError:
-                    # If date parsing fails, use None
-                    current_date = None
-        
+    # Single pass over the log (newest commit first), tracking the date of the current commit.
+    # Lines between "diff --git" and the first "@@" hunk line are file headers (including
+    # "+++ b/<path>"); inside hunks every "+" line is added content, even one starting with "++".
+    in_diff_header = False
+    for line in git_lines:
+        if line.startswith("\x00"):
+            current_date = datetime.fromisoformat(line[1:].strip())
+        elif line.startswith("diff --git "):
+            in_diff_header = True
+        elif line.startswith("@@"):
+            in_diff_header = False
         # Extract added lines
-        if current_date:
-            added_lines = addition_pattern.findall(commit)
-            for line in added_lines:
-                line = line.strip()
-                # Skip empty lines and diff markers
-                if line and not line.startswith("+++"):
-                    # Store only the earliest date a line was added (since we're iterating from newest to oldest)
-                    if line not in content_dates:
-                        content_dates[line] = current_date
+        elif current_date and not in_diff_header and line.startswith("+"):
+            line = line[1:].strip()
+            # Store only the earliest date a line was added (since we're iterating from newest to oldest)
+            if line:
+                content_dates.setdefault(line, current_date)
+                # Older commits can only add lines, never change dates already recorded,
+                # so the rest of the history is not needed once every needed line is dated
+                if missing_lines is not None:
+                    missing_lines.discard(line)
+                    if not missing_lines:
+                        break
     
     return content_dates
 
-def parse_markdown_content(md_file_path):
-    """Parse the markdown file to extract all content with structure preservation."""
+def read_markdown_file(md_file_path):
+    """Read the markdown file once so its content can be shared by every processing step."""
     try:
         with open(md_file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # Split into lines for processing
-        lines = content.split("\n")
-        
+            return f.read()
+    except Exception as e:
+        print(f"Error reading markdown file: {e}")
+        return ""
+
+def parse_markdown_content(content):
+    """Parse markdown content to extract all content with structure preservation."""
+    try:
         # Extract all meaningful content lines with their structural context
         content_items = []
         current_section = "General"
@@ -76,17 +94,25 @@ def parse_markdown_content(md_file_path):
         in_list = False
         list_level = 0
         
-        for i, line in enumerate(lines):
+        # Single walk over the lines classifies structure and extracts links together.
+        # Split on "\n" only, like the git output, so lines containing other Unicode
+        # line separators stay whole and can still match their git counterpart.
+        for i, line in enumerate(content.split("\n")):
             line_content = line.strip()
             
             # Skip empty lines
             if not line_content:
                 continue
+            
+            # Extract (text, url) links while the line is at hand so matching never re-scans content;
+            # the substring check keeps link-free lines out of the regex engine entirely
+            links = _LINK_RE.findall(line_content) if "](" in line_content else []
                 
             # Track headers (sections)
             if line_content.startswith("#"):
-                header_level = len(re.match(r'^#+', line_content).group())
-                header_text = line_content.lstrip("#").strip()
+                header_text = line_content.lstrip("#")
+                header_level = len(line_content) - len(header_text)
+                header_text = header_text.strip()
                 
                 if header_level == 1:
                     current_section = header_text
@@ -100,12 +126,15 @@ def parse_markdown_content(md_file_path):
                     "section": current_section,
                     "subsection": current_subsection if header_level > 1 else None,
                     "type": "header",
+                    "links": links,
                     "level": header_level,
                     "line_number": i
                 })
             
-            # Track list items
-            elif line_content.startswith(("-", "*", "+")) or re.match(r'^\d+\.', line_content):
+            # Track list items (bullets, or digits followed by a dot)
+            elif line_content[0] in "-*+" or (
+                line_content[0].isdigit() and line_content.lstrip("0123456789").startswith(".")
+            ):
                 in_list = True
                 # Calculate list level based on indentation
                 current_indent = len(line) - len(line.lstrip())
@@ -116,6 +145,7 @@ def parse_markdown_content(md_file_path):
                     "section": current_section,
                     "subsection": current_subsection,
                     "type": "list_item",
+                    "links": links,
                     "level": list_level,
                     "line_number": i
                 })
@@ -128,6 +158,7 @@ def parse_markdown_content(md_file_path):
                     "section": current_section,
                     "subsection": current_subsection,
                     "type": "text",
+                    "links": links,
                     "line_number": i
                 })
         
@@ -136,42 +167,82 @@ def parse_markdown_content(md_file_path):
         print(f"Error parsing markdown file: {e}")
         return []
 
+@lru_cache(maxsize=None)
+def normalize_whitespace(text):
+    """Collapse runs of whitespace into single spaces; cached while match_content_to_dates runs."""
+    return _WS_RE.sub(' ', text).strip()
+
+def tokenize_for_matching(text):
+    """Split normalized text into the distinctive lowercase tokens used to find fuzzy match candidates."""
+    return {token for token in _WS_RE.split(text.lower()) if len(token) >= 4}
+
 def match_content_to_dates(content_items, content_dates):
     """Match markdown content to their git addition dates using fuzzy matching."""
-    matched_items = []
+    # Positions (indexes into content_items) of items matched directly/fuzzily, and of those left unmatched
+    dated_positions = []
+    unmatched_positions = []
     
-    for item in content_items:
+    # Index git lines by token so fuzzy matching only compares against lines sharing words with the item
+    git_lines = list(content_dates)
+    normalized_git_lines = [normalize_whitespace(git_line) for git_line in git_lines]
+    token_index = defaultdict(list)
+    normalized_dates = {}
+    url_to_date = {}
+    for line_id, normalized_git_line in enumerate(normalized_git_lines):
+        date = content_dates[git_lines[line_id]]
+        # Keep the date of the first git line with each normalized form
+        normalized_dates.setdefault(normalized_git_line, date)
+        # Link URLs rarely change when entries are edited, so remember when each URL first appeared
+        if "](" in normalized_git_line:
+            for _, url in _LINK_RE.findall(normalized_git_line):
+                if url not in url_to_date or date < url_to_date[url]:
+                    url_to_date[url] = date
+        for token in tokenize_for_matching(normalized_git_line):
+            token_index[token].append(line_id)
+    
+    for position, item in enumerate(content_items):
         # Direct match
         if item["content"] in content_dates:
             item["date"] = content_dates[item["content"]]
-            matched_items.append(item)
+            dated_positions.append(position)
             continue
 
+        # Check for exact match after normalization
+        normalized_content = normalize_whitespace(item["content"])
+        if normalized_content in normalized_dates:
+            item["date"] = normalized_dates[normalized_content]
+            dated_positions.append(position)
+            continue
+        
+        # If item contains a link whose URL appears in the git history, date it from the URL
+        link_url = item["links"][0][1] if item["links"] else None
+        if link_url in url_to_date:
+            item["date"] = url_to_date[link_url]
+            dated_positions.append(position)
+            continue
+        
         # Try fuzzy matching for items without direct matches
         best_match = None
         best_score = 0
         
-        # Try to match with different normalization techniques
-        normalized_content = re.sub(r'\s+', ' ', item["content"]).strip()
+        # Only the 20 git lines sharing the most tokens with the item are worth a full comparison
+        candidate_counts = Counter(chain.from_iterable(
+            token_index.get(token, ()) for token in tokenize_for_matching(normalized_content)
+        ))
         
-        for git_line, date in content_dates.items():
-            normalized_git_line = re.sub(r'\s+', ' ', git_line).strip()
-            
-            # Check for exact match after normalization
-            if normalized_content == normalized_git_line:
-                best_match = git_line
-                best_score = 1.0
-                break
+        for line_id, _ in candidate_counts.most_common(20):
+            git_line = git_lines[line_id]
+            normalized_git_line = normalized_git_lines[line_id]
             
-            # Compute similarity ratio for fuzzy matching
-            similarity = difflib.SequenceMatcher(None, normalized_content, normalized_git_line).ratio()
+            # Compute similarity ratio for fuzzy matching; quick_ratio() is an upper bound
+            # on ratio(), so the full comparison is skipped when it cannot pass the threshold
+            matcher = difflib.SequenceMatcher(None, normalized_content, normalized_git_line)
+            similarity = matcher.ratio() if matcher.quick_ratio() > 0.7 else 0
             
             # If item contains a link, also try matching just the link portion
-            if "[" in normalized_content and "](" in normalized_content:
-                link_match = re.search(r'\[(.*?)\]\((.*?)\)', normalized_content)
-                if link_match and link_match.group(2) in normalized_git_line:
-                    # Boost similarity score for URL matches
-                    similarity = max(similarity, 0.8)
+            if link_url and link_url in normalized_git_line:
+                # Boost similarity score for URL matches
+                similarity = max(similarity, 0.8)
             
             if similarity > 0.7 and similarity > best_score:  # 70% similarity threshold
                 best_match = git_line
@@ -179,90 +250,84 @@ def match_content_to_dates(content_items, content_dates):
         
         if best_match:
             item["date"] = content_dates[best_match]
-            matched_items.append(item)
+            dated_positions.append(position)
         else:
-            # For items without any match, use context to infer date
-            # (assign date based on surrounding content with known dates)
-            context_dates = []
-            context_range = 3  # Check 3 items before and after
-            
-            # Look for dated items before this one
-            for i in range(1, context_range + 1):
-                idx = item["line_number"] - i
-                if idx >= 0 and idx < len(content_items):
-                    context_item = content_items[idx]
-                    if "date" in context_item and context_item["date"]:
-                        context_dates.append(context_item["date"])
-                        break
-            
-            # Look for dated items after this one
-            for i in range(1, context_range + 1):
-                idx = item["line_number"] + i
-                if idx < len(content_items):
-                    context_item = content_items[idx]
-                    if "date" in context_item and context_item["date"]:
-                        context_dates.append(context_item["date"])
-                        break
-            
-            # Use the average date or nearest date as an approximation
-            if context_dates:
-                item["date"] = min(context_dates)  # Use the earliest date as an approximation
-                item["date_inferred"] = True
-                matched_items.append(item)
+            unmatched_positions.append(position)
+    
+    # For items without any match, use context to infer date
+    # (assign date based on the nearest matched items before and after it)
+    inferred_positions = []
+    context_range = 3  # Check 3 items before and after
+    for position in unmatched_positions:
+        # dated_positions is built in content order, so it is already sorted
+        idx = bisect_left(dated_positions, position)
+        context_dates = [
+            content_items[dated_positions[i]]["date"]
+            for i in (idx - 1, idx)
+            if 0 <= i < len(dated_positions) and abs(dated_positions[i] - position) <= context_range
+        ]
+        
+        if context_dates:
+            item = content_items[position]
+            item["date"] = min(context_dates)  # Use the earliest date as an approximation
+            item["date_inferred"] = True
+            inferred_positions.append(position)
+    
+    # Drop the normalized history lines so they are not kept alive once this file is done
+    normalize_whitespace.cache_clear()
     
-    return matched_items
+    # Return matched items in their original content order
+    return [content_items[position] for position in sorted(dated_positions + inferred_positions)]
 
 def generate_chronological_md(sorted_content, output_file):
     """Generate a new markdown file with content sorted chronologically."""
-    # Group items by month/year
-    items_by_month = defaultdict(list)
+    dated_items = [item for item in sorted_content if "date" in item and item["date"]]
     
-    for item in sorted_content:
-        if "date" in item and item["date"]:
-            month_year = item["date"].strftime("%B %Y")
-            items_by_month[month_year].append(item)
+    # Within a month, sections keep the order in which they first appear in the input
+    section_order = {}
+    for item in dated_items:
+        section_order.setdefault((item["date"].year, item["date"].month, item["section"]), len(section_order))
     
-    # Sort months (newest first)
-    sorted_months = sorted(items_by_month.keys(), 
-                          key=lambda x: datetime.strptime(x, "%B %Y"), 
-                          reverse=True)
+    # Order items newest month first, then by section, then newest first within each section,
+    # so months and sections can be grouped in one sequential pass
+    dated_items.sort(key=lambda x: (
+        -x["date"].year,
+        -x["date"].month,
+        section_order[(x["date"].year, x["date"].month, x["section"])],
+        -x["date"].timestamp(),
+    ))
     
-    # Write to output file
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("# Chronological Content\n\n")
-        f.write("*Reordered by addition date, newest first*\n\n")
+    # Build the whole document in memory and write it in one call
+    parts = ["# Chronological Content\n\n", "*Reordered by addition date, newest first*\n\n"]
+    
+    for (year, month), month_items in groupby(dated_items, key=lambda x: (x["date"].year, x["date"].month)):
+        # Format the "Month Year" label once per month
+        month_label = datetime(year, month, 1).strftime("%B %Y")
+        parts.append(f"\n## {month_label}\n\n")
         
-        for month in sorted_months:
-            f.write(f"\n## {month}\n\n")
+        # Write items grouped by section
+        for section, items in groupby(month_items, key=lambda x: x["section"]):
+            # Write a miniature section header
+            parts.append(f"### From '{section}'\n\n")
             
-            # Group items by section within each month
-            section_items = defaultdict(list)
-            for item in items_by_month[month]:
-                section_items[item["section"]].append(item)
+            for item in items:
+                # Format based on item type
+                if item["type"] == "header":
+                    # Skip writing section headers that we've already accounted for
+                    continue
+                elif item["type"] == "list_item":
+                    # Preserve list formatting
+                    parts.append(f"{item['content']}\n")
+                else:
+                    # Regular text
+                    parts.append(f"{item['content']}\n")
             
-            # Write items grouped by section
-            for section, items in section_items.items():
-                # Write a miniature section header
-                f.write(f"### From '{section}'\n\n")
-                
-                # Sort items by date (newest first) within the section
-                items.sort(key=lambda x: x["date"], reverse=True)
-                
-                for item in items:
-                    # Format based on item type
-                    if item["type"] == "header":
-                        # Skip writing section headers that we've already accounted for
-                        continue
-                    elif item["type"] == "list_item":
-                        # Preserve list formatting
-                        f.write(f"{item['content']}\n")
-                    else:
-                        # Regular text
-                        f.write(f"{item['content']}\n")
-                
-                f.write("\n")
-        
-        f.write("\n\n*This file was automatically generated based on git history.*")
+            parts.append("\n")
+    
+    parts.append("\n\n*This file was automatically generated based on git history.*")
+    
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
     
     print(f"Chronological markdown written to {output_file}")
 
@@ -272,53 +337,45 @@ def main():
     md_file = input("Enter the markdown file name (default: README.md): ").strip() or "README.md"
     output_file = input("Enter the output file name (default: README_CHRONOLOGICAL.md): ").strip() or "README_CHRONOLOGICAL.md"
     
-    # Change to the repository directory
-    original_dir = os.getcwd()
-    os.chdir(repo_path)
+    # Parse markdown file
+    print("Parsing markdown file...")
+    md_file_path = os.path.join(repo_path, md_file)
+    content = read_markdown_file(md_file_path)
+    content_items = parse_markdown_content(content)
     
-    try:
-        # Get git history
-        print("Getting git history...")
-        git_history = get_git_history(md_file)
-        
-        # Extract content with dates
-        print("Extracting content with dates from git history...")
-        content_dates = extract_content_with_dates(git_history)
-        
-        # Parse markdown file
-        print("Parsing markdown file...")
-        md_file_path = os.path.join(repo_path, md_file)
-        content_items = parse_markdown_content(md_file_path)
-        
-        # Match content to dates
-        print("Matching content to addition dates...")
-        matched_items = match_content_to_dates(content_items, content_dates)
-        
-        # Sort matched items by date (newest first)
-        sorted_content = sorted(
-            matched_items, 
-            key=lambda x: x.get("date", datetime.min), 
-            reverse=True
+    # Stream git history and extract content with dates, stopping once every markdown line is dated
+    print("Extracting content with dates from git history...")
+    with closing(iter_git_lines(md_file, cwd=repo_path)) as git_lines:
+        content_dates = extract_content_with_dates(
+            git_lines, needed_lines={item["content"] for item in content_items}
         )
-        
-        # Generate chronological markdown
-        print("Generating chronological markdown...")
-        output_file_path = os.path.join(repo_path, output_file)
-        generate_chronological_md(sorted_content, output_file_path)
-        
-        # Report statistics
-        total_items = len(content_items)
-        matched_items_count = len(matched_items)
-        match_rate = (matched_items_count / total_items) * 100 if total_items > 0 else 0
-        
-        print(f"\nMatching Statistics:")
-        print(f"Total content items: {total_items}")
-        print(f"Items with dates matched: {matched_items_count} ({match_rate:.1f}%)")
-        
-        print("\nDone!")
-    finally:
-        # Return to the original directory
-        os.chdir(original_dir)
+    
+    # Match content to dates
+    print("Matching content to addition dates...")
+    matched_items = match_content_to_dates(content_items, content_dates)
+    
+    # Sort matched items by date (newest first)
+    sorted_content = sorted(
+        matched_items, 
+        key=lambda x: x.get("date", datetime.min), 
+        reverse=True
+    )
+    
+    # Generate chronological markdown
+    print("Generating chronological markdown...")
+    output_file_path = os.path.join(repo_path, output_file)
+    generate_chronological_md(sorted_content, output_file_path)
+    
+    # Report statistics
+    total_items = len(content_items)
+    matched_items_count = len(matched_items)
+    match_rate = (matched_items_count / total_items) * 100 if total_items > 0 else 0
+    
+    print(f"\nMatching Statistics:")
+    print(f"Total content items: {total_items}")
+    print(f"Items with dates matched: {matched_items_count} ({match_rate:.1f}%)")
+    
+    print("\nDone!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file